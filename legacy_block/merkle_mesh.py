@@ -101,9 +101,7 @@ class MerkleMesh:
         # Add cross-shard references
         if cross_shard_refs:
             for shard_id, ref_hash in cross_shard_refs:
-                if shard_id not in self.cross_refs:
-                    self.cross_refs[shard_id] = set()
-                self.cross_refs[shard_id].add(ref_hash)
+                self.cross_refs.setdefault(shard_id, set()).add(ref_hash)
 
     def build(self) -> None:
         """
@@ -255,9 +255,7 @@ class FractalBlockchain:
             block: New block with potential cross-refs
         """
         for shard_id in block.header.cross_shard_refs:
-            if shard_id not in self.cross_refs:
-                self.cross_refs[shard_id] = {}
-            self.cross_refs[shard_id][block.block_hash] = block
+            self.cross_refs.setdefault(shard_id, {})[block.block_hash] = block
 
     def get_block(self, block_hash: str) -> Optional[FractalBlock]:
         """Get block by hash."""
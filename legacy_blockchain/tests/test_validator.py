@@ -141,6 +141,15 @@ def test_basic_block_validation(validator, sample_block):
     assert error is not None
     assert context is None
 
+def test_duplicate_transaction_rejected(validator, sample_block, sample_transaction):
+    """Test that a block repeating a transaction is rejected before consensus."""
+    sample_block.add_transaction(sample_transaction)
+    
+    valid, error, context = validator.validate_block(sample_block)
+    assert not valid
+    assert "Duplicate transaction" in error
+    assert context is None
+
 def test_transaction_validation(validator, sample_block, mock_utxo_storage):
     """Test transaction validation within block."""
     # Add UTXO to storage
@@ -5,7 +5,7 @@ This class handles comprehensive block validation, including transaction
 verification, UTXO state updates, and cross-shard coordination.
 """
 
-from typing import Dict, List, Optional, Tuple, Set
+from typing import Any, Dict, List, Optional, Tuple, Set
 from legacy_block.block import FractalBlock
 from legacy_transaction.transaction import FractalTransaction
 from .consensus import ShardConsensus
@@ -74,6 +74,18 @@ class BlockValidator:
                      context: Optional[ValidationContext])
         """
         try:
+            # Cheap structural checks first, before any hashing
+            if block is None:
+                return False, "Missing block", None
+
+            if block.get_shard_id() != self.consensus.shard_id:
+                return False, "Block belongs to different shard", None
+
+            txs = block.transactions
+            tx_ids = {tx.tx_id for tx in txs}
+            if len(tx_ids) != len(txs):
+                return False, "Duplicate transaction in block", None
+
             # Create validation context
             context = ValidationContext()
 
@@ -92,7 +104,7 @@ class BlockValidator:
                 return False, error, None
 
             # Validate each transaction
-            for tx in block.transactions:
+            for tx in txs:
                 valid, error = self._validate_transaction(tx, block, context)
                 if not valid:
                     return False, error, None
@@ -138,29 +150,34 @@ class BlockValidator:
             if not valid:
                 return False, error
 
+            tx_id = transaction.tx_id
+
             # Check for double-spends within block
+            spent = context.spent_utxos
+            spent_add = spent.add
             for tx_input in transaction.inputs:
-                if tx_input.utxo_id in context.spent_utxos:
-                    return False, f"Double-spend of UTXO {tx_input.utxo_id}"
-                context.spent_utxos.add(tx_input.utxo_id)
+                utxo_id = tx_input.utxo_id
+                if utxo_id in spent:
+                    return False, f"Double-spend of UTXO {utxo_id}"
+                spent_add(utxo_id)
 
             # Track created UTXOs
-            for i, output in enumerate(transaction.outputs):
-                utxo_id = f"{transaction.tx_id}:{i}"
-                context.created_utxos[utxo_id] = transaction
+            created = context.created_utxos
+            for i in range(len(transaction.outputs)):
+                created[f"{tx_id}:{i}"] = transaction
 
             # For cross-shard transactions, validate proof
             if transaction.cross_shard:
-                if transaction.tx_id not in block.cross_shard_proofs:
+                proofs = block.cross_shard_proofs
+                if tx_id not in proofs:
                     return False, "Missing cross-shard proof"
 
-                proof = block.cross_shard_proofs[transaction.tx_id]
+                proof = proofs[tx_id]
                 
                 # Track cross-shard dependencies
+                deps = context.cross_shard_deps
                 for shard_id in proof.target_shards:
-                    if shard_id not in context.cross_shard_deps:
-                        context.cross_shard_deps[shard_id] = set()
-                    context.cross_shard_deps[shard_id].add(transaction.tx_id)
+                    deps.setdefault(shard_id, set()).add(tx_id)
 
             return True, None
 
@@ -185,6 +202,10 @@ class BlockValidator:
             Tuple of (is_valid: bool, error_message: Optional[str])
         """
         try:
+            txs = block.transactions
+            proofs = block.cross_shard_proofs
+            refs = block.header.cross_shard_refs
+
             # Check each cross-shard dependency
             for shard_id, tx_ids in context.cross_shard_deps.items():
                 # Verify referenced block exists
@@ -194,7 +215,7 @@ class BlockValidator:
                 ref_block = cross_shard_refs[shard_id]
 
                 # Verify block reference is properly formatted
-                ref_data = block.header.cross_shard_refs.get(shard_id)
+                ref_data = refs.get(shard_id)
                 if not ref_data:
                     return False, f"Missing cross-ref data for shard {shard_id}"
 
@@ -213,7 +234,7 @@ class BlockValidator:
                 # Verify each transaction is properly referenced
                 for tx_id in tx_ids:
                     tx = None
-                    for block_tx in block.transactions:
+                    for block_tx in txs:
                         if block_tx.tx_id == tx_id:
                             tx = block_tx
                             break
@@ -221,18 +242,18 @@ class BlockValidator:
                     if not tx:
                         return False, f"Missing transaction {tx_id}"
 
-                    proof = block.cross_shard_proofs.get(tx_id)
+                    proof = proofs.get(tx_id)
                     if not proof:
                         return False, f"Missing proof for {tx_id}"
 
                     # Verify proof against referenced block
                     mesh_roots = {
                         s: r.split("|")[0]
-                        for s, r in block.header.cross_shard_refs.items()
+                        for s, r in refs.items()
                     }
                     block_hashes = {
                         s: r.split("|")[1]
-                        for s, r in block.header.cross_shard_refs.items()
+                        for s, r in refs.items()
                     }
 
                     valid, error = proof.verify(mesh_roots, block_hashes)
@@ -264,11 +285,13 @@ class BlockValidator:
             for utxo_id in context.spent_utxos:
                 self.utxo_storage.remove_utxo(utxo_id)
 
-            # Add new UTXOs
+            # Add new UTXOs; transactions were validated in validate_block
+            # and their inputs are already removed, so skip revalidation
             for tx in block.transactions:
                 success, error, new_utxos = tx.execute(
                     self.utxo_storage,
-                    block.header.height
+                    block.header.height,
+                    validated=True
                 )
                 if not success:
                     return False, f"Failed to execute transaction: {error}"
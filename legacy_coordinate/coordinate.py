@@ -5,11 +5,65 @@ This class represents positions in a Sierpinski triangle coordinate system,
 enabling fractal-based sharding and spatial routing.
 """
 
-from typing import List, Tuple
+from typing import Iterator, List, Tuple
 import math
 import hashlib
 from functools import lru_cache
 
+# Precomputed constants for Cartesian conversion
+_SQRT3 = math.sqrt(3)
+_SQRT3_2 = _SQRT3 / 2
+_SQRT3_4 = _SQRT3 / 4
+_SQRT3_6 = _SQRT3 / 6
+
+@lru_cache(maxsize=10000)
+def _path_to_cartesian(path: Tuple[int, ...]) -> Tuple[float, float]:
+    """
+    Walk a fractal path down from the centroid of the unit triangle.
+
+    Keyed on the path tuple so equal coordinates share one cache entry.
+
+    Args:
+        path: Sequence of sub-triangle moves (0, 1, 2)
+
+    Returns:
+        Tuple[float, float]: The (x, y) coordinates in Cartesian space
+    """
+    # Start at centroid of the full triangle
+    x, y = 0.5, _SQRT3_6  # centroid of (0,0)-(1,0)-(0.5,√3/2)
+    scale = 1.0
+
+    for move in path:
+        scale /= 2
+        if move == 0:  # Left sub-triangle
+            x -= scale / 2
+            y += scale * _SQRT3_4
+        elif move == 1:  # Center (top) sub-triangle
+            y += scale * _SQRT3_2
+        elif move == 2:  # Right sub-triangle
+            x += scale / 2
+            y += scale * _SQRT3_4
+
+    return (x, y)
+
+@lru_cache(maxsize=65536)
+def _coord_hash(depth: int, path: Tuple[int, ...]) -> str:
+    """
+    SHA-256 hex digest of a serialized (depth, path) pair.
+
+    Cached so identical coordinates across many UTXOs and blocks are
+    hashed only once.
+
+    Args:
+        depth: Coordinate depth
+        path: Coordinate path
+
+    Returns:
+        str: Hex-encoded SHA-256 hash
+    """
+    serialized = f"{depth}:" + ",".join(map(str, path))
+    return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
 class FractalCoordinate:
     """
     Represents a position in the fractal Sierpinski triangle coordinate system.
@@ -54,7 +108,6 @@ class FractalCoordinate:
             return NotImplemented
         return self.depth == other.depth and self.path == other.path
 
-    @lru_cache(maxsize=10000)
     def to_cartesian(self) -> Tuple[float, float]:
         """
         Convert this fractal coordinate to (x, y) Cartesian coordinates
@@ -65,29 +118,14 @@ class FractalCoordinate:
             Tuple[float, float]: The (x, y) coordinates in Cartesian space
 
         Note:
-            Uses caching to improve performance for repeated conversions
+            Results are cached by path, so repeated conversions of equal
+            coordinates are a single dictionary lookup
         """
         try:
-            # Start at centroid of the full triangle
-            x, y = 0.5, math.sqrt(3) / 6  # centroid of (0,0)-(1,0)-(0.5,√3/2)
-            scale = 1.0
-
-            for move in self.path:
-                scale /= 2
-                if move == 0:  # Left sub-triangle
-                    x -= scale / 2
-                    y += scale * (math.sqrt(3) / 4)
-                elif move == 1:  # Center (top) sub-triangle
-                    y += scale * (math.sqrt(3) / 2)
-                elif move == 2:  # Right sub-triangle
-                    x += scale / 2
-                    y += scale * (math.sqrt(3) / 4)
-
-            return (x, y)
+            return _path_to_cartesian(tuple(self.path))
         except Exception as e:
             raise ValueError(f"Error converting to Cartesian coordinates: {str(e)}")
 
-    @lru_cache(maxsize=10000)
     def get_hash(self) -> str:
         """
         Return a SHA-256 hex digest of the coordinate (depth + path).
@@ -97,8 +135,7 @@ class FractalCoordinate:
             str: Hex-encoded SHA-256 hash of the coordinate
         """
         try:
-            serialized = f"{self.depth}:" + ",".join(map(str, self.path))
-            return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+            return _coord_hash(self.depth, tuple(self.path))
         except Exception as e:
             raise ValueError(f"Error computing coordinate hash: {str(e)}")
 
@@ -125,6 +162,21 @@ class FractalCoordinate:
             return self
         return FractalCoordinate(self.depth - 1, self.path[:-1])
 
+    def iter_children(self) -> Iterator['FractalCoordinate']:
+        """
+        Lazily yield the 3 direct children (depth+1) in order 0, 1, 2.
+
+        Lets callers that only need one child (e.g. routing to a shard)
+        stop early without allocating all three.
+
+        Yields:
+            FractalCoordinate: Child coordinates
+        """
+        depth = self.depth + 1
+        path = self.path
+        for i in (0, 1, 2):
+            yield FractalCoordinate(depth, path + [i])
+
     def get_children(self) -> List['FractalCoordinate']:
         """
         Return the 3 direct children (depth+1) with paths:
@@ -133,10 +185,7 @@ class FractalCoordinate:
         Returns:
             List[FractalCoordinate]: List of three child coordinates
         """
-        return [
-            FractalCoordinate(self.depth + 1, self.path + [i])
-            for i in (0, 1, 2)
-        ]
+        return list(self.iter_children())
 
     def distance_to(self, other: 'FractalCoordinate') -> float:
         """
@@ -104,6 +104,11 @@ def test_parent_child_relationships():
     assert all(c.depth == 1 for c in children)
     assert [c.path[0] for c in children] == [0, 1, 2]
 
+    # Lazy iteration yields the same children
+    assert list(child.iter_children()) == child.get_children()
+    first = next(child.iter_children())
+    assert first.path == [1, 2, 0]
+
 def test_distance_calculation():
     """Test Euclidean distance calculations."""
     # Distance from point to itself should be 0
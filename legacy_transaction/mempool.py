@@ -5,8 +5,10 @@ This class manages pending transactions that have not yet been included in block
 with support for sharding and priority-based transaction selection.
 """
 
-from typing import Dict, List, Set, Optional, Tuple
+from typing import Any, Dict, FrozenSet, List, Set, Optional, Tuple
 import time
+from itertools import islice
+from sortedcontainers import SortedKeyList
 from .transaction import FractalTransaction
 
 class MempoolEntry:
@@ -18,15 +20,31 @@ class MempoolEntry:
         fee (float): Transaction fee (input sum - output sum)
         fee_per_byte (float): Fee divided by transaction size
         timestamp (int): When transaction was added to mempool
-        in_blocks (Set[str]): Block IDs that included this transaction
+        in_blocks (Optional[Set[str]]): Block IDs that included this transaction,
+                                        allocated on first inclusion
+        shards (FrozenSet[int]): Distinct shard IDs of the transaction's outputs
     """
 
+    __slots__ = ('transaction', 'fee', 'fee_per_byte', 'timestamp', 'in_blocks', 'shards')
+
     def __init__(self, transaction: FractalTransaction):
         self.transaction = transaction
         self.fee = 0.0  # Set when added to mempool
         self.fee_per_byte = 0.0  # Set when added to mempool
         self.timestamp = int(time.time())
-        self.in_blocks: Set[str] = set()
+        self.in_blocks: Optional[Set[str]] = None
+        self.shards: FrozenSet[int] = frozenset(
+            out.shard_id for out in transaction.outputs
+        )
+
+def _fee_rate_key(entry: MempoolEntry) -> Tuple[float, str]:
+    """
+    Sort key for fee-ordered mempool indices.
+
+    The transaction ID breaks fee-rate ties, so every key is unique and
+    removal bisects straight to the entry instead of scanning its ties.
+    """
+    return (entry.fee_per_byte, entry.transaction.tx_id)
 
 class TransactionMempool:
     """
@@ -34,8 +52,12 @@ class TransactionMempool:
 
     Attributes:
         _transactions (Dict[str, MempoolEntry]): All transactions by ID
-        _shard_txs (Dict[int, Set[str]]): Transaction IDs by shard
+        _by_fee (SortedKeyList): All entries ordered by fee rate (lowest first)
+        _shard_txs (Dict[int, SortedKeyList]): Entries by shard, ordered by fee rate
         _spent_utxos (Dict[str, str]): Maps spent UTXO IDs to spending tx ID
+        _by_block (Dict[str, Set[str]]): Transaction IDs by including block ID
+        _validated_height (Optional[int]): Height at which _validated_txs were checked
+        _validated_txs (Set[str]): Transaction IDs that passed validate() at that height
         max_size (int): Maximum number of transactions to store
         min_fee_per_byte (float): Minimum fee rate to accept transaction
     """
@@ -49,8 +71,12 @@ class TransactionMempool:
             min_fee_per_byte: Minimum fee rate to accept transaction
         """
         self._transactions: Dict[str, MempoolEntry] = {}
-        self._shard_txs: Dict[int, Set[str]] = {}
+        self._by_fee = SortedKeyList(key=_fee_rate_key)
+        self._shard_txs: Dict[int, SortedKeyList] = {}
         self._spent_utxos: Dict[str, str] = {}
+        self._by_block: Dict[str, Set[str]] = {}
+        self._validated_height: Optional[int] = None
+        self._validated_txs: Set[str] = set()
         self.max_size = max_size
         self.min_fee_per_byte = min_fee_per_byte
 
@@ -76,34 +102,44 @@ class TransactionMempool:
             if transaction.tx_id in self._transactions:
                 return False, "Transaction already in mempool"
 
-            # Validate transaction
-            valid, error = transaction.validate(utxo_storage, current_height, self)
-            if not valid:
-                return False, error
-
-            # Calculate fee and fee rate
-            input_sum = 0.0
+            # Reject mempool double-spends before any signature work
             for tx_input in transaction.inputs:
-                utxo = utxo_storage.get_utxo(tx_input.utxo_id)
-                if utxo:
-                    input_sum += utxo.amount
-
-            output_sum = sum(out.amount for out in transaction.outputs)
-            fee = input_sum - output_sum
-
-            # Estimate transaction size (simplified)
-            tx_size = len(str(transaction.to_dict()))  # Simple approximation
-            fee_per_byte = fee / tx_size
+                if tx_input.utxo_id in self._spent_utxos:
+                    return False, f"Input UTXO {tx_input.utxo_id} already spent in mempool"
+
+            # Validate transaction, unless it already passed at this height
+            if current_height != self._validated_height:
+                self._validated_height = current_height
+                self._validated_txs.clear()
+
+            if transaction.tx_id not in self._validated_txs:
+                valid, error = transaction.validate(utxo_storage, current_height, self)
+                if not valid:
+                    return False, error
+                self._validated_txs.add(transaction.tx_id)
+
+            # Calculate fee (cached so re-admission after a reorg is cheap)
+            fee = transaction.fee
+            if fee is None:
+                input_sum = 0.0
+                for tx_input in transaction.inputs:
+                    utxo = utxo_storage.get_utxo(tx_input.utxo_id)
+                    if utxo:
+                        input_sum += utxo.amount
+
+                output_sum = sum(out.amount for out in transaction.outputs)
+                fee = transaction.fee = input_sum - output_sum
+
+            fee_per_byte = fee / transaction.size_bytes
 
             # Check minimum fee rate
             if fee_per_byte < self.min_fee_per_byte:
                 return False, "Fee rate too low"
 
-            # Check mempool size limit
+            # When full, only admit a transaction that outbids the
+            # lowest fee-rate entry, which is evicted below
             if len(self._transactions) >= self.max_size:
-                # Try to make room by removing lowest fee transactions
-                self._prune_low_fee_transactions()
-                if len(self._transactions) >= self.max_size:
+                if not self._by_fee or fee_per_byte <= self._by_fee[0].fee_per_byte:
                     return False, "Mempool full"
 
             # Create mempool entry
@@ -111,20 +147,24 @@ class TransactionMempool:
             entry.fee = fee
             entry.fee_per_byte = fee_per_byte
 
-            # Add to main index
+            # Add to main indices
             self._transactions[transaction.tx_id] = entry
+            self._by_fee.add(entry)
 
             # Add to shard indices
-            for output in transaction.outputs:
-                shard = output.coordinate.get_shard_id()
-                if shard not in self._shard_txs:
-                    self._shard_txs[shard] = set()
-                self._shard_txs[shard].add(transaction.tx_id)
+            for shard in entry.shards:
+                shard_txs = self._shard_txs.get(shard)
+                if shard_txs is None:
+                    shard_txs = self._shard_txs[shard] = SortedKeyList(key=_fee_rate_key)
+                shard_txs.add(entry)
 
             # Mark UTXOs as spent
             for tx_input in transaction.inputs:
                 self._spent_utxos[tx_input.utxo_id] = transaction.tx_id
 
+            # Evict lowest fee-rate entries beyond the size limit
+            self._prune_low_fee_transactions()
+
             return True, None
 
         except Exception as e:
@@ -137,23 +177,34 @@ class TransactionMempool:
         Args:
             tx_id: Transaction ID to remove
         """
-        if tx_id not in self._transactions:
+        entry = self._transactions.get(tx_id)
+        if entry is None:
             return
 
-        tx = self._transactions[tx_id].transaction
+        tx = entry.transaction
 
-        # Remove from shard indices
-        for output in tx.outputs:
-            shard = output.coordinate.get_shard_id()
-            if shard in self._shard_txs:
-                self._shard_txs[shard].discard(tx_id)
-                if not self._shard_txs[shard]:
+        # Remove from fee-ordered indices
+        self._by_fee.discard(entry)
+        for shard in entry.shards:
+            shard_txs = self._shard_txs.get(shard)
+            if shard_txs is not None:
+                shard_txs.discard(entry)
+                if not shard_txs:
                     del self._shard_txs[shard]
 
         # Remove spent UTXO records
         for tx_input in tx.inputs:
             self._spent_utxos.pop(tx_input.utxo_id, None)
 
+        # Remove from block index
+        if entry.in_blocks:
+            for block_id in entry.in_blocks:
+                block_txs = self._by_block.get(block_id)
+                if block_txs is not None:
+                    block_txs.discard(tx_id)
+                    if not block_txs:
+                        del self._by_block[block_id]
+
         # Remove from main index
         del self._transactions[tx_id]
 
@@ -187,28 +238,18 @@ class TransactionMempool:
         Returns:
             List of transactions, ordered by fee rate (highest first)
         """
-        if shard_id not in self._shard_txs:
+        shard_txs = self._shard_txs.get(shard_id)
+        if not shard_txs:
             return []
 
-        # Get all transactions for shard
-        entries = [
-            self._transactions[tx_id]
-            for tx_id in self._shard_txs[shard_id]
-            if tx_id in self._transactions
-        ]
-
-        # Filter by minimum fee rate if specified
+        # Entries below the bisection point fall under the minimum fee rate,
+        # so the filter needs no per-entry comparison
         if min_fee_per_byte is not None:
-            entries = [
-                entry for entry in entries
-                if entry.fee_per_byte >= min_fee_per_byte
-            ]
-
-        # Sort by fee rate
-        entries.sort(key=lambda e: e.fee_per_byte, reverse=True)
+            eligible = len(shard_txs) - shard_txs.bisect_key_left((min_fee_per_byte, ""))
+            max_count = min(max_count, eligible)
 
-        # Return transactions up to max_count
-        return [entry.transaction for entry in entries[:max_count]]
+        # Walk the shard index from highest fee rate down
+        return [entry.transaction for entry in islice(reversed(shard_txs), max_count)]
 
     def is_utxo_spent(self, utxo_id: str) -> bool:
         """
@@ -240,18 +281,9 @@ class TransactionMempool:
 
     def _prune_low_fee_transactions(self) -> None:
         """Remove lowest fee-rate transactions when mempool is full."""
-        if len(self._transactions) <= self.max_size:
-            return
-
-        # Sort by fee rate
-        entries = list(self._transactions.values())
-        entries.sort(key=lambda e: e.fee_per_byte)
-
-        # Remove lowest fee transactions until under limit
-        for entry in entries:
-            if len(self._transactions) <= self.max_size:
-                break
-            self.remove_transaction(entry.transaction.tx_id)
+        # Pop lowest fee-rate entries until under limit
+        while len(self._transactions) > self.max_size:
+            self.remove_transaction(self._by_fee[0].transaction.tx_id)
 
     def mark_included_in_block(self, tx_id: str, block_id: str) -> None:
         """
@@ -263,7 +295,10 @@ class TransactionMempool:
         """
         entry = self._transactions.get(tx_id)
         if entry:
+            if entry.in_blocks is None:
+                entry.in_blocks = set()
             entry.in_blocks.add(block_id)
+            self._by_block.setdefault(block_id, set()).add(tx_id)
 
     def remove_block_transactions(self, block_id: str) -> None:
         """
@@ -272,15 +307,18 @@ class TransactionMempool:
         Args:
             block_id: Block ID to remove transactions for
         """
-        to_remove = [
-            tx_id for tx_id, entry in self._transactions.items()
-            if block_id in entry.in_blocks
-        ]
-        for tx_id in to_remove:
+        # Block changes alter UTXO state; drop cached validation results
+        self._validated_txs.clear()
+
+        for tx_id in list(self._by_block.get(block_id, ())):
             self.remove_transaction(tx_id)
 
     def clear(self) -> None:
         """Clear all transactions from mempool."""
         self._transactions.clear()
+        self._by_fee.clear()
         self._shard_txs.clear()
         self._spent_utxos.clear()
+        self._by_block.clear()
+        self._validated_height = None
+        self._validated_txs.clear()
@@ -2,6 +2,7 @@
 Tests for the TransactionMempool class.
 """
 
+import struct
 import pytest
 from legacy_coordinate.coordinate import FractalCoordinate
 from legacy_utxo.utxo import FractalUTXO
@@ -12,6 +13,11 @@ from legacy_transaction.transaction import (
 )
 from legacy_transaction.mempool import TransactionMempool, MempoolEntry
 
+def next_float_up(value):
+    """Smallest float greater than a positive finite value."""
+    bits = struct.unpack("<q", struct.pack("<d", value))[0]
+    return struct.unpack("<d", struct.pack("<q", bits + 1))[0]
+
 @pytest.fixture
 def sample_coordinate():
     """Create a sample coordinate for testing."""
@@ -65,7 +71,7 @@ def test_mempool_entry(sample_transaction):
     assert entry.transaction == sample_transaction
     assert entry.fee == 0.0  # Initial fee
     assert entry.fee_per_byte == 0.0  # Initial fee rate
-    assert entry.in_blocks == set()
+    assert entry.in_blocks is None  # Allocated on first inclusion
     assert entry.timestamp > 0
 
 def test_mempool_initialization(mempool):
@@ -87,6 +93,7 @@ def test_add_transaction(mempool, sample_transaction, mock_utxo_storage):
     assert success
     assert error is None
     assert sample_transaction.tx_id in mempool._transactions
+    assert sample_transaction.fee == pytest.approx(0.5)
     
     # Try adding same transaction again
     success, error = mempool.add_transaction(
@@ -97,20 +104,76 @@ def test_add_transaction(mempool, sample_transaction, mock_utxo_storage):
     assert not success
     assert "already in mempool" in error
 
-def test_mempool_size_limit(mempool, sample_coordinate, mock_utxo_storage):
+def test_conflicting_spend_rejected(mempool, sample_transaction, sample_coordinate, mock_utxo_storage):
+    """Test that a mempool double-spend is rejected before validation."""
+    mempool.add_transaction(sample_transaction, mock_utxo_storage, 101)
+    
+    conflict = FractalTransaction(
+        inputs=[TransactionInput("utxo123", "sig_other", "0xpubkey789")],
+        outputs=[TransactionOutput("0x9999", 9.0, sample_coordinate)],
+        nonce=54321
+    )
+    
+    class ExplodingStorage:
+        def get_utxo(self, utxo_id):
+            raise AssertionError("validate() should not run")
+    
+    success, error = mempool.add_transaction(conflict, ExplodingStorage(), 101)
+    assert not success
+    assert "already spent in mempool" in error
+
+def test_validation_cached_per_height(mempool, sample_transaction, mock_utxo_storage):
+    """Test that a re-sent transaction is not revalidated at the same height."""
+    calls = []
+    original_validate = sample_transaction.validate
+    
+    def counting_validate(*args, **kwargs):
+        calls.append(args)
+        return original_validate(*args, **kwargs)
+    
+    sample_transaction.validate = counting_validate
+    
+    mempool.add_transaction(sample_transaction, mock_utxo_storage, 101)
+    mempool.remove_transaction(sample_transaction.tx_id)
+    mempool.add_transaction(sample_transaction, mock_utxo_storage, 101)
+    assert len(calls) == 1
+    
+    # A new height invalidates the cache
+    mempool.remove_transaction(sample_transaction.tx_id)
+    mempool.add_transaction(sample_transaction, mock_utxo_storage, 102)
+    assert len(calls) == 2
+
+def test_mempool_size_limit(mempool, sample_coordinate):
     """Test mempool size limiting."""
-    # Create multiple transactions
+    class MultiStorage:
+        def __init__(self):
+            self.utxos = {}
+
+        def get_utxo(self, utxo_id):
+            return self.utxos.get(utxo_id)
+    
+    storage = MultiStorage()
+    
+    # Create multiple transactions, each spending its own UTXO
     transactions = []
-    for i in range(6):  # One more than max_size
+    for i in range(7):
+        utxo = FractalUTXO(
+            owner_address="0x1234",
+            amount=10.0,
+            coordinate=sample_coordinate,
+            creation_height=i
+        )
+        storage.utxos[utxo.utxo_id] = utxo
+        
         tx_input = TransactionInput(
-            utxo_id="utxo123",
+            utxo_id=utxo.utxo_id,
             signature=f"sig{i}",
             public_key="0xpubkey789"
         )
         
         tx_output = TransactionOutput(
             owner_address="0x5678",
-            amount=9.5 - i,  # Different amounts -> different fees
+            amount=9.5 - i if i < 6 else 9.9,  # Different amounts -> different fees
             coordinate=sample_coordinate
         )
         
@@ -125,19 +188,33 @@ def test_mempool_size_limit(mempool, sample_coordinate, mock_utxo_storage):
     for i in range(5):
         success, _ = mempool.add_transaction(
             transactions[i],
-            mock_utxo_storage,
+            storage,
             current_height=101
         )
         assert success
     
-    # Try adding one more
+    # A higher fee than the lowest entry evicts it
     success, error = mempool.add_transaction(
         transactions[5],
-        mock_utxo_storage,
+        storage,
+        current_height=101
+    )
+    assert success
+    assert error is None
+    assert len(mempool._transactions) == 5
+    assert transactions[0].tx_id not in mempool._transactions
+    assert transactions[5].tx_id in mempool._transactions
+    assert not mempool.is_utxo_spent(transactions[0].inputs[0].utxo_id)
+    
+    # A lower fee than every entry is rejected
+    success, error = mempool.add_transaction(
+        transactions[6],
+        storage,
         current_height=101
     )
     assert not success
     assert "Mempool full" in error
+    assert len(mempool._transactions) == 5
 
 def test_remove_transaction(mempool, sample_transaction, mock_utxo_storage):
     """Test removing transactions from mempool."""
@@ -220,6 +297,7 @@ def test_block_inclusion(mempool, sample_transaction, mock_utxo_storage):
     # Remove block's transactions
     mempool.remove_block_transactions(block_id)
     assert sample_transaction.tx_id not in mempool._transactions
+    assert block_id not in mempool._by_block
 
 def test_fee_based_pruning(mempool, sample_coordinate, mock_utxo_storage):
     """Test pruning based on transaction fees."""
@@ -260,6 +338,99 @@ def test_fee_based_pruning(mempool, sample_coordinate, mock_utxo_storage):
     # Verify lowest fee transaction was removed
     assert len(mempool._transactions) == mempool.max_size
 
+def test_full_mempool_evicts_lowest_fee(sample_coordinate):
+    """Test that a full mempool admits only transactions that outbid its lowest fee."""
+    class MultiStorage:
+        def __init__(self):
+            self.utxos = {}
+        
+        def get_utxo(self, utxo_id):
+            return self.utxos.get(utxo_id)
+    
+    storage = MultiStorage()
+    mempool = TransactionMempool(max_size=2, min_fee_per_byte=0.0)
+    
+    def make_tx(i, amount):
+        utxo = FractalUTXO(
+            owner_address="0x1234",
+            amount=10.0,
+            coordinate=sample_coordinate,
+            creation_height=i
+        )
+        storage.utxos[utxo.utxo_id] = utxo
+        return FractalTransaction(
+            inputs=[TransactionInput(utxo.utxo_id, f"sig{i}", "0xpubkey789")],
+            outputs=[TransactionOutput("0x5678", amount, sample_coordinate)],
+            nonce=i
+        )
+    
+    low = make_tx(1, 9.9)
+    mid = make_tx(2, 9.0)
+    assert mempool.add_transaction(low, storage, 101)[0]
+    assert mempool.add_transaction(mid, storage, 101)[0]
+    
+    # Lower fee than everything in the pool is rejected
+    success, error = mempool.add_transaction(make_tx(3, 9.95), storage, 101)
+    assert not success
+    assert "Mempool full" in error
+    
+    # Higher fee evicts the lowest entry
+    high = make_tx(4, 5.0)
+    success, _ = mempool.add_transaction(high, storage, 101)
+    assert success
+    assert low.tx_id not in mempool._transactions
+    assert set(mempool._transactions) == {mid.tx_id, high.tx_id}
+
+def test_shard_transactions_min_fee(sample_coordinate):
+    """Test the minimum fee rate filter at entry fee-rate boundaries."""
+    class MultiStorage:
+        def __init__(self):
+            self.utxos = {}
+
+        def get_utxo(self, utxo_id):
+            return self.utxos.get(utxo_id)
+    
+    storage = MultiStorage()
+    mempool = TransactionMempool(max_size=10, min_fee_per_byte=0.0)
+    shard = sample_coordinate.get_shard_id()
+    
+    txs = []
+    for i, amount in enumerate([9.9, 9.0, 5.0]):
+        utxo = FractalUTXO(
+            owner_address="0x1234",
+            amount=10.0,
+            coordinate=sample_coordinate,
+            creation_height=i
+        )
+        storage.utxos[utxo.utxo_id] = utxo
+        tx = FractalTransaction(
+            inputs=[TransactionInput(utxo.utxo_id, f"sig{i}", "0xpubkey789")],
+            outputs=[TransactionOutput("0x5678", amount, sample_coordinate)],
+            nonce=i
+        )
+        assert mempool.add_transaction(tx, storage, 101)[0]
+        txs.append(tx)
+    low, mid, high = txs
+    rates = {tx.tx_id: mempool._transactions[tx.tx_id].fee_per_byte for tx in txs}
+    assert rates[low.tx_id] < rates[mid.tx_id] < rates[high.tx_id]
+    
+    # Equal to an entry's rate keeps that entry
+    result = mempool.get_shard_transactions(shard, min_fee_per_byte=rates[mid.tx_id])
+    assert result == [high, mid]
+    
+    # Just above an entry's rate drops it
+    just_above = next_float_up(rates[mid.tx_id])
+    result = mempool.get_shard_transactions(shard, min_fee_per_byte=just_above)
+    assert result == [high]
+    
+    # Above every entry returns nothing
+    result = mempool.get_shard_transactions(shard, min_fee_per_byte=rates[high.tx_id] * 2)
+    assert result == []
+    
+    # max_count still applies after filtering
+    result = mempool.get_shard_transactions(shard, max_count=1, min_fee_per_byte=0.0)
+    assert result == [high]
+
 def test_clear_mempool(mempool, sample_transaction, mock_utxo_storage):
     """Test clearing the entire mempool."""
     mempool.add_transaction(sample_transaction, mock_utxo_storage, 101)
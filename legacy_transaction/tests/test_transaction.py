@@ -2,6 +2,7 @@
 Tests for the FractalTransaction class.
 """
 
+import json
 import pytest
 from legacy_coordinate.coordinate import FractalCoordinate
 from legacy_utxo.utxo import FractalUTXO
@@ -56,6 +57,7 @@ def test_transaction_input():
     assert tx_input.utxo_id == "utxo123"
     assert tx_input.signature == "sig456"
     assert tx_input.public_key == "0xpubkey789"
+    assert not hasattr(tx_input, "__dict__")
     
     # Test serialization
     data = tx_input.to_dict()
@@ -75,6 +77,8 @@ def test_transaction_output(sample_coordinate):
     assert output.amount == 9.5
     assert output.coordinate == sample_coordinate
     assert output.script == "OP_CHECKSIG"  # default
+    assert output.shard_id == sample_coordinate.get_shard_id()
+    assert not hasattr(output, "__dict__")
     
     # Test invalid amount
     with pytest.raises(ValueError, match="amount must be positive"):
@@ -117,6 +121,48 @@ def test_transaction_creation(sample_input, sample_output):
     with pytest.raises(ValueError, match="must have at least one output"):
         FractalTransaction(inputs=[sample_input], outputs=[], nonce=1)
 
+def test_transaction_fee(sample_input, sample_output):
+    """Test the fee is unset until computed and can be set only once."""
+    tx = FractalTransaction(
+        inputs=[sample_input],
+        outputs=[sample_output],
+        nonce=12345
+    )
+    assert tx.fee is None
+    
+    tx.fee = 0.5
+    assert tx.fee == 0.5
+    with pytest.raises(ValueError):
+        tx.fee = 1.0
+    assert tx.fee == 0.5
+
+def test_transaction_size(sample_input, sample_output):
+    """Test cached serialized size estimate."""
+    tx = FractalTransaction(
+        inputs=[sample_input],
+        outputs=[sample_output],
+        nonce=12345
+    )
+    
+    size = tx.size_bytes
+    assert size > 0
+    assert tx.size_bytes == size  # Cached
+    
+    # Size is the UTF-8 length of the canonical compact JSON
+    tx = FractalTransaction(
+        inputs=[sample_input],
+        outputs=[TransactionOutput(
+            owner_address="0x\u00e9\u4e16",
+            amount=1e-7,
+            coordinate=sample_output.coordinate
+        )],
+        nonce=12345
+    )
+    expected = json.dumps(
+        tx.to_dict(), separators=(",", ":"), ensure_ascii=False
+    ).encode("utf-8")
+    assert tx.size_bytes == len(expected)
+
 def test_transaction_id_computation(sample_input, sample_output):
     """Test transaction ID computation and uniqueness."""
     tx1 = FractalTransaction(
@@ -141,6 +187,42 @@ def test_transaction_id_computation(sample_input, sample_output):
     )
     assert tx1.tx_id != tx3.tx_id
 
+def test_transaction_id_preimage(sample_input, sample_output):
+    """Test the packed ID preimage is stable and accepts any int nonce."""
+    tx = FractalTransaction(
+        inputs=[sample_input],
+        outputs=[sample_output],
+        nonce=12345
+    )
+    tx.timestamp = 1700000000
+    assert tx.compute_id() == (
+        "275c64b74f6b8e265fc717d08a155d68dc46103572a196da546e471a0b95b3ef"
+    )
+    
+    # Nonces outside the 64-bit range are valid and stay distinct
+    ids = set()
+    for nonce in (0, -1, 2**63 - 1, 2**63, 2**200):
+        tx = FractalTransaction(
+            inputs=[sample_input],
+            outputs=[sample_output],
+            nonce=nonce
+        )
+        tx.timestamp = 1700000000
+        ids.add(tx.compute_id())
+    assert len(ids) == 5
+    
+    # Strings longer than 65535 bytes still hash, and stay distinct
+    long_input = TransactionInput("u" * 70000, "sig", "0xpubkey")
+    long_output = TransactionOutput("0x" + "a" * 70000, 1.0, sample_output.coordinate)
+    tx1 = FractalTransaction(inputs=[long_input], outputs=[long_output], nonce=1)
+    tx2 = FractalTransaction(
+        inputs=[TransactionInput("u" * 70001, "sig", "0xpubkey")],
+        outputs=[long_output],
+        nonce=1
+    )
+    tx2.timestamp = tx1.timestamp
+    assert tx1.compute_id() != tx2.compute_id()
+
 def test_cross_shard_detection(sample_input):
     """Test detection of cross-shard transactions."""
     coord1 = FractalCoordinate(depth=1, path=[0])  # Shard 0
@@ -205,6 +287,28 @@ def test_transaction_validation(sample_input, sample_output):
     )
     assert valid
     assert error is None
+    
+    # Storage with a batch lookup is asked for all inputs at once
+    class BatchUTXOStorage(MockUTXOStorage):
+        def __init__(self):
+            self.requested = []
+
+        def get_many(self, utxo_ids):
+            self.requested.append(list(utxo_ids))
+            return {
+                utxo_id: super(BatchUTXOStorage, self).get_utxo(utxo_id)
+                for utxo_id in utxo_ids
+                if utxo_id == "utxo123"
+            }
+
+        def get_utxo(self, utxo_id):
+            raise AssertionError("get_many should be used")
+    
+    storage = BatchUTXOStorage()
+    valid, error = tx.validate(utxo_storage=storage, current_height=101)
+    assert valid
+    assert error is None
+    assert storage.requested == [["utxo123"]]
 
 def test_transaction_execution(sample_input, sample_output):
     """Test transaction execution."""
@@ -236,6 +340,15 @@ def test_transaction_execution(sample_input, sample_output):
     assert len(new_utxos) == 1
     assert new_utxos[0].owner_address == "0x5678"
     assert new_utxos[0].amount == 9.5
+    
+    # Pre-validated transactions execute without consulting storage
+    success, error, new_utxos = tx.execute(
+        utxo_storage=None,
+        current_height=101,
+        validated=True
+    )
+    assert success
+    assert len(new_utxos) == 1
 
 def test_transaction_serialization(sample_input, sample_output):
     """Test transaction serialization and deserialization."""
@@ -262,6 +375,26 @@ def test_transaction_serialization(sample_input, sample_output):
     assert len(tx2.outputs) == 1
     assert tx2.nonce == tx.nonce
     assert tx2.cross_shard == tx.cross_shard
+    
+    # Round-trip through JSON bytes
+    raw = tx.to_bytes()
+    assert json.loads(raw) == data
+    tx3 = FractalTransaction.from_bytes(raw)
+    assert tx3.tx_id == tx.tx_id
+    assert tx.size_bytes == len(raw)
+    
+    with pytest.raises(ValueError, match="Error deserializing"):
+        FractalTransaction.from_bytes(b"not json")
+    
+    # Trusted loads keep the stored ID and timestamp without rehashing
+    stored = dict(data, tx_id="f" * 64, timestamp=data["timestamp"] - 60)
+    with pytest.raises(ValueError, match="Transaction ID mismatch"):
+        FractalTransaction.from_dict(stored)
+    tx4 = FractalTransaction.from_dict(stored, verify=False)
+    assert tx4.tx_id == "f" * 64
+    assert tx4.timestamp == data["timestamp"] - 60
+    assert tx4.cross_shard == tx.cross_shard
+    assert tx4.to_dict() == stored
 
 def test_contract_transaction(sample_input, sample_coordinate):
     """Test transaction with contract calls."""
@@ -6,11 +6,30 @@ with support for cross-shard operations and smart contract calls.
 """
 
 from typing import List, Dict, Any, Optional, Tuple
+from functools import cached_property
 import hashlib
+import json
+import struct
 import time
 from legacy_coordinate.coordinate import FractalCoordinate
 from legacy_utxo.utxo import FractalUTXO
 
+def _length_prefixed(value: str) -> bytes:
+    """Encode a string as UTF-8 with a 4-byte little-endian length prefix."""
+    data = value.encode("utf-8")
+    return struct.pack("<I", len(data)) + data
+
+def _length_prefixed_int(value: int) -> bytes:
+    """Encode an int of any size as signed little-endian bytes with a 2-byte length prefix."""
+    data = value.to_bytes((value.bit_length() + 8) // 8, "little", signed=True)
+    return struct.pack("<H", len(data)) + data
+
+def _json_default(obj: Any) -> Dict[str, Any]:
+    """Serialize transaction parts nested inside a transaction payload."""
+    if isinstance(obj, (TransactionInput, TransactionOutput)):
+        return obj.to_dict()
+    raise TypeError(f"Cannot serialize {type(obj).__name__}")
+
 class TransactionInput:
     """
     Represents an input to a transaction (a UTXO being spent).
@@ -20,11 +39,14 @@ class TransactionInput:
         signature (str): Signature proving ownership
         public_key (str): Public key corresponding to UTXO owner
     """
-    
+
+    __slots__ = ('utxo_id', 'signature', 'public_key', '_id_bytes')
+
     def __init__(self, utxo_id: str, signature: str, public_key: str):
         self.utxo_id = utxo_id
         self.signature = signature
         self.public_key = public_key
+        self._id_bytes = _length_prefixed(utxo_id)
 
     def to_dict(self) -> Dict[str, str]:
         """Convert to dictionary for serialization."""
@@ -42,11 +64,17 @@ class TransactionOutput:
         owner_address (str): Address of recipient
         amount (float): Amount of coins
         coordinate (FractalCoordinate): Position in fractal space
+        shard_id (int): Derived from coordinate.get_shard_id()
         script (str): Script controlling how output can be spent
         contract_state_hash (Optional[str]): For contract calls
         gas_limit (Optional[int]): For contract calls
     """
-    
+
+    __slots__ = (
+        'owner_address', 'amount', 'coordinate', 'shard_id', 'script',
+        'contract_state_hash', 'gas_limit', '_id_bytes'
+    )
+
     def __init__(
         self,
         owner_address: str,
@@ -62,9 +90,15 @@ class TransactionOutput:
         self.owner_address = owner_address
         self.amount = amount
         self.coordinate = coordinate
+        self.shard_id = coordinate.get_shard_id()
         self.script = script
         self.contract_state_hash = contract_state_hash
         self.gas_limit = gas_limit
+        self._id_bytes = (
+            _length_prefixed(owner_address)
+            + struct.pack("<d", amount)
+            + coordinate.get_hash().encode("ascii")
+        )
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for serialization."""
@@ -97,6 +131,7 @@ class FractalTransaction:
         nonce (int): Random value for uniqueness
         tx_id (str): Unique transaction identifier (hash)
         cross_shard (bool): Whether transaction spans multiple shards
+        fee (Optional[float]): Input sum minus output sum, once computed
     """
 
     def __init__(
@@ -126,36 +161,72 @@ class FractalTransaction:
         self.timestamp = int(time.time())
         self.nonce = nonce
         self.tx_id = self.compute_id()
-        
-        # Determine if transaction crosses shard boundaries
-        output_shards = {out.coordinate.get_shard_id() for out in outputs}
-        self.cross_shard = len(output_shards) > 1
+        self._init_derived()
+
+    def _init_derived(self) -> None:
+        """Set state derived from inputs and outputs rather than stored."""
+        # Determine if transaction crosses shard boundaries, stopping at
+        # the first output outside the first output's shard
+        first_shard = self.outputs[0].shard_id
+        self.cross_shard = any(
+            out.shard_id != first_shard for out in self.outputs
+        )
+
+        # Fee filled in lazily by the mempool
+        self._fee: Optional[float] = None
 
     def compute_id(self) -> str:
         """
-        Compute unique transaction ID as SHA-256 hash of:
-          input_utxos | output_data | timestamp | nonce
+        Compute unique transaction ID as SHA-256 hash of the packed preimage:
+          input/output counts | input_utxos | output_data | timestamp | nonce
+
+        Each input and output contributes bytes pre-encoded at construction
+        (length-prefixed strings, little-endian amount, coordinate hash),
+        so no string formatting happens here. Timestamp and nonce are
+        length-prefixed signed integers, so any int nonce is accepted.
 
         Returns:
             str: Hex-encoded transaction ID
         """
         try:
-            # Concatenate input UTXO IDs
-            input_str = "|".join(inp.utxo_id for inp in self.inputs)
-            
-            # Concatenate output data
-            output_str = "|".join(
-                f"{out.owner_address}:{out.amount}:{out.coordinate.get_hash()}"
-                for out in self.outputs
-            )
-            
-            # Combine all components
-            data = f"{input_str}|{output_str}|{self.timestamp}|{self.nonce}"
-            return hashlib.sha256(data.encode("utf-8")).hexdigest()
+            parts = [struct.pack("<II", len(self.inputs), len(self.outputs))]
+            parts.extend(inp._id_bytes for inp in self.inputs)
+            parts.extend(out._id_bytes for out in self.outputs)
+            parts.append(_length_prefixed_int(self.timestamp))
+            parts.append(_length_prefixed_int(self.nonce))
+            return hashlib.sha256(b"".join(parts)).hexdigest()
             
         except Exception as e:
             raise ValueError(f"Error computing transaction ID: {str(e)}")
 
+    @cached_property
+    def size_bytes(self) -> int:
+        """
+        Serialized size of the transaction in bytes.
+
+        Computed once from the compact JSON encoding of to_bytes().
+
+        Returns:
+            int: Size in bytes
+        """
+        return len(self.to_bytes())
+
+    @property
+    def fee(self) -> Optional[float]:
+        """
+        Transaction fee (input sum - output sum), or None until computed.
+
+        Set once by whoever first looks up the inputs, e.g. the mempool,
+        so re-admission after a reorg skips the UTXO lookups.
+        """
+        return self._fee
+
+    @fee.setter
+    def fee(self, value: float) -> None:
+        if self._fee is not None:
+            raise ValueError("Transaction fee already set")
+        self._fee = value
+
     def validate(
         self,
         utxo_storage: Any,
@@ -177,9 +248,20 @@ class FractalTransaction:
             # Check that all inputs exist and are unspent
             input_sum = 0.0
             input_utxos: List[FractalUTXO] = []
+            input_ids = [tx_input.utxo_id for tx_input in self.inputs]
+            get_many = getattr(utxo_storage, "get_many", None)
+            if get_many is not None:
+                utxos = get_many(input_ids)
+            else:
+                # Storage without batch lookup: fetch inputs one at a time
+                utxos = {}
+                for utxo_id in input_ids:
+                    utxo = utxo_storage.get_utxo(utxo_id)
+                    if utxo is not None:
+                        utxos[utxo_id] = utxo
             
             for tx_input in self.inputs:
-                utxo = utxo_storage.get_utxo(tx_input.utxo_id)
+                utxo = utxos.get(tx_input.utxo_id)
                 if not utxo:
                     return False, f"Input UTXO {tx_input.utxo_id} not found"
                 
@@ -228,7 +310,8 @@ class FractalTransaction:
     def execute(
         self,
         utxo_storage: Any,
-        current_height: int
+        current_height: int,
+        validated: bool = False
     ) -> Tuple[bool, Optional[str], List[FractalUTXO]]:
         """
         Execute the transaction, creating new UTXOs.
@@ -236,15 +319,18 @@ class FractalTransaction:
         Args:
             utxo_storage: UTXOStorage instance
             current_height: Current block height
+            validated: Skip validation because the caller has already
+                       validated this transaction against the same state
 
         Returns:
             Tuple of (success: bool, error: Optional[str], new_utxos: List[FractalUTXO])
         """
         try:
-            # First validate the transaction
-            valid, error = self.validate(utxo_storage, current_height)
-            if not valid:
-                return False, error, []
+            # First validate the transaction, unless the caller already has
+            if not validated:
+                valid, error = self.validate(utxo_storage, current_height)
+                if not valid:
+                    return False, error, []
             
             # Create new UTXOs from outputs
             new_utxos: List[FractalUTXO] = []
@@ -277,13 +363,72 @@ class FractalTransaction:
             "cross_shard": self.cross_shard
         }
 
+    def to_bytes(self) -> bytes:
+        """
+        Serialize transaction to compact JSON bytes.
+
+        Inputs and outputs are handed to the encoder as objects rather than
+        pre-built lists of dicts. This is the canonical encoding that
+        size_bytes measures, so it uses only the standard library and
+        writes non-ASCII text as UTF-8 rather than escapes.
+
+        Returns:
+            bytes: UTF-8 JSON encoding of to_dict()
+        """
+        data = {
+            "tx_id": self.tx_id,
+            "inputs": self.inputs,
+            "outputs": self.outputs,
+            "timestamp": self.timestamp,
+            "nonce": self.nonce,
+            "cross_shard": self.cross_shard
+        }
+        return json.dumps(
+            data,
+            default=_json_default,
+            separators=(",", ":"),
+            ensure_ascii=False
+        ).encode("utf-8")
+
+    @classmethod
+    def from_bytes(
+        cls,
+        data: bytes,
+        verify: bool = True
+    ) -> 'FractalTransaction':
+        """
+        Create transaction from JSON bytes produced by to_bytes().
+
+        Args:
+            data: UTF-8 JSON encoded transaction
+            verify: Recompute and check the transaction ID (see from_dict)
+
+        Returns:
+            New FractalTransaction instance
+
+        Raises:
+            ValueError: If data is invalid
+        """
+        try:
+            parsed = json.loads(data)
+        except Exception as e:
+            raise ValueError(f"Error deserializing transaction: {str(e)}")
+        return cls.from_dict(parsed, verify=verify)
+
     @classmethod
-    def from_dict(cls, data: Dict[str, Any]) -> 'FractalTransaction':
+    def from_dict(
+        cls,
+        data: Dict[str, Any],
+        verify: bool = True
+    ) -> 'FractalTransaction':
         """
         Create transaction from dictionary representation.
 
         Args:
             data: Dictionary with transaction data
+            verify: Recompute and check the transaction ID. Pass False only
+                    for data from a trusted source (e.g. our own store); the
+                    stored ID and timestamp are then taken as-is.
 
         Returns:
             New FractalTransaction instance
@@ -321,6 +466,17 @@ class FractalTransaction:
                 )
                 outputs.append(output)
             
+            if not verify:
+                # Trusted source: restore stored fields without rehashing
+                tx = cls.__new__(cls)
+                tx.inputs = inputs
+                tx.outputs = outputs
+                tx.timestamp = data["timestamp"]
+                tx.nonce = data["nonce"]
+                tx.tx_id = data["tx_id"]
+                tx._init_derived()
+                return tx
+
             # Create transaction with original nonce
             tx = cls(inputs=inputs, outputs=outputs, nonce=data["nonce"])
             
@@ -30,7 +30,12 @@ class UTXOSpatialIndexer:
     Attributes:
         _points (List[Tuple[float, float]]): List of point coordinates
         _ids (List[str]): Parallel list of UTXO IDs
+        _id_to_idx (Dict[str, int]): Maps UTXO IDs to their position in _points/_ids
         _kdtree (Optional[KDTree]): KD-tree for spatial queries if scipy available
+        _kdtree_ids (List[str]): UTXO IDs in KD-tree point order at last build
+        _pending (Set[str]): UTXO IDs inserted since the last KD-tree build
+        _stale (Set[str]): KD-tree UTXO IDs removed since the last build
+        _dirty (int): Inserts and removals since the last KD-tree build
         _grid (Dict[Tuple[int, int], GridCell]): Grid cells for fallback indexing
         _grid_size (float): Cell size for grid-based indexing
     """
@@ -44,10 +49,15 @@ class UTXOSpatialIndexer:
         """
         self._points: List[Tuple[float, float]] = []
         self._ids: List[str] = []
+        self._id_to_idx: Dict[str, int] = {}
         self._kdtree: Optional[KDTree] = None
+        self._kdtree_ids: List[str] = []
+        self._pending: Set[str] = set()
+        self._stale: Set[str] = set()
+        self._dirty = 0
         self._grid: Dict[Tuple[int, int], GridCell] = {}
         self._grid_size = grid_size
-        self._rebuild_threshold = 500  # Rebuild KD-tree after this many inserts
+        self._rebuild_threshold = 500  # Min changes before a KD-tree rebuild
 
     def _get_grid_cell(self, point: Tuple[float, float]) -> Tuple[int, int]:
         """
@@ -85,11 +95,44 @@ class UTXOSpatialIndexer:
                 cells.append((i, j))
         return cells
 
+    def _farthest_cell_offset(
+        self,
+        cell_idx: Tuple[int, int],
+        center: Tuple[float, float]
+    ) -> Tuple[float, float]:
+        """
+        Get the per-axis offset from center to the farthest corner of a cell.
+
+        Cell bounds follow _get_grid_cell, which truncates toward zero, so
+        cell 0 spans both sides of the origin. Bounds are widened slightly
+        to stay conservative under floating-point rounding.
+
+        Args:
+            cell_idx: Grid cell indices (i, j)
+            center: Reference point (x, y)
+
+        Returns:
+            Tuple of (dx, dy) to the farthest corner
+        """
+        size = self._grid_size
+        margin = size * 1e-9
+        offsets = []
+        for idx, c in zip(cell_idx, center):
+            lo = (idx - 1 if idx <= 0 else idx) * size - margin
+            hi = (idx + 1 if idx >= 0 else idx) * size + margin
+            offsets.append(max(abs(c - lo), abs(hi - c)))
+        return offsets[0], offsets[1]
+
     def rebuild_index(self) -> None:
         """
         Rebuild KD-tree from current points.
-        Called automatically after many inserts/removals.
+        Called lazily from query_range once enough changes accumulate.
         """
+        self._kdtree_ids = list(self._ids)
+        self._pending.clear()
+        self._stale.clear()
+        self._dirty = 0
+
         if KDTree and self._points:
             try:
                 self._kdtree = KDTree(self._points)
@@ -99,6 +142,22 @@ class UTXOSpatialIndexer:
         else:
             self._kdtree = None
 
+    def _needs_rebuild(self) -> bool:
+        """
+        Whether accumulated changes justify rebuilding the KD-tree.
+
+        Points inserted since the last build are merged into the tree once
+        they outnumber sqrt(n), keeping the per-query overlay small; other
+        changes wait for max(_rebuild_threshold, n/4).
+        """
+        if not KDTree:
+            return False
+        n = len(self._points)
+        return (
+            len(self._pending) > math.isqrt(n)
+            or self._dirty >= max(self._rebuild_threshold, n // 4)
+        )
+
     def insert(self, utxo_id: str, coord: Tuple[float, float]) -> None:
         """
         Insert a new point into the spatial index.
@@ -110,8 +169,13 @@ class UTXOSpatialIndexer:
         Raises:
             ValueError: If insertion fails
         """
+        if utxo_id in self._id_to_idx:
+            raise ValueError(f"UTXO {utxo_id} already indexed")
+
+        cell_idx: Optional[Tuple[int, int]] = None
         try:
             # Add to main lists
+            self._id_to_idx[utxo_id] = len(self._ids)
             self._ids.append(utxo_id)
             self._points.append(coord)
 
@@ -121,17 +185,16 @@ class UTXOSpatialIndexer:
                 self._grid[cell_idx] = GridCell()
             self._grid[cell_idx].points[utxo_id] = coord
 
-            # Rebuild KD-tree if needed
-            if KDTree and len(self._points) % self._rebuild_threshold == 0:
-                self.rebuild_index()
+            # Defer KD-tree rebuild to the next query
+            if self._kdtree is not None:
+                self._pending.add(utxo_id)
+            self._dirty += 1
 
         except Exception as e:
             # Rollback on error
-            if utxo_id in self._ids:
-                idx = self._ids.index(utxo_id)
-                self._ids.pop(idx)
-                self._points.pop(idx)
-            if cell_idx in self._grid:
+            if utxo_id in self._id_to_idx:
+                self._pop_index(utxo_id)
+            if cell_idx is not None and cell_idx in self._grid:
                 self._grid[cell_idx].points.pop(utxo_id, None)
             raise ValueError(f"Error inserting point: {str(e)}")
 
@@ -146,12 +209,12 @@ class UTXOSpatialIndexer:
         Raises:
             ValueError: If point not found or removal fails
         """
+        if utxo_id not in self._id_to_idx:
+            raise ValueError(f"UTXO {utxo_id} not indexed")
+
         try:
             # Remove from main lists
-            if utxo_id in self._ids:
-                idx = self._ids.index(utxo_id)
-                self._ids.pop(idx)
-                self._points.pop(idx)
+            self._pop_index(utxo_id)
 
             # Remove from grid
             cell_idx = self._get_grid_cell(coord)
@@ -160,13 +223,35 @@ class UTXOSpatialIndexer:
                 if not self._grid[cell_idx].points:
                     del self._grid[cell_idx]
 
-            # Rebuild KD-tree if it exists
+            # Mask out of the KD-tree until the next rebuild
             if self._kdtree is not None:
-                self.rebuild_index()
+                if utxo_id in self._pending:
+                    self._pending.discard(utxo_id)
+                else:
+                    self._stale.add(utxo_id)
+            self._dirty += 1
 
         except Exception as e:
             raise ValueError(f"Error removing point: {str(e)}")
 
+    def _pop_index(self, utxo_id: str) -> None:
+        """
+        Remove a UTXO from the parallel point/ID lists in O(1).
+
+        The last entry is swapped into the vacated slot, so list order is
+        not preserved.
+
+        Args:
+            utxo_id: UTXO identifier (must be indexed)
+        """
+        idx = self._id_to_idx.pop(utxo_id)
+        last_id = self._ids.pop()
+        last_point = self._points.pop()
+        if idx < len(self._ids):
+            self._ids[idx] = last_id
+            self._points[idx] = last_point
+            self._id_to_idx[last_id] = idx
+
     def query_range(self, center: Tuple[float, float], radius: float) -> List[str]:
         """
         Find all UTXO IDs within radius of center point.
@@ -179,31 +264,167 @@ class UTXOSpatialIndexer:
             List of UTXO IDs within the radius
 
         Notes:
-            Uses KD-tree if available, otherwise falls back to grid-based search
+            Uses KD-tree if available, otherwise falls back to grid-based search.
+            Points changed since the last KD-tree build are reconciled here;
+            the tree is rebuilt only once enough changes accumulate.
         """
-        if self._kdtree:
+        if self._needs_rebuild():
+            self.rebuild_index()
+
+        if self._kdtree is not None:
             try:
                 # Use KD-tree for efficient search
                 indices = self._kdtree.query_ball_point(center, radius)
-                return [self._ids[i] for i in indices]
+                return self._reconcile_tree_hits(indices, center, radius * radius)
             except Exception as e:
                 print(f"Warning: KD-tree query failed: {str(e)}, falling back to grid search")
 
         # Grid-based fallback search
-        result_ids: Set[str] = set()
+        result_ids: List[str] = []
         cells = self._get_neighboring_cells(center, radius)
         radius_sq = radius * radius
+        cx, cy = center
+        grid = self._grid
 
         for cell_idx in cells:
-            if cell_idx in self._grid:
-                cell = self._grid[cell_idx]
-                for utxo_id, point in cell.points.items():
-                    dx = point[0] - center[0]
-                    dy = point[1] - center[1]
-                    if dx*dx + dy*dy <= radius_sq:
-                        result_ids.add(utxo_id)
+            cell = grid.get(cell_idx)
+            if cell is None:
+                continue
+
+            # Cells lying wholly inside the circle need no per-point check
+            fx, fy = self._farthest_cell_offset(cell_idx, center)
+            if fx*fx + fy*fy <= radius_sq:
+                result_ids.extend(cell.points)
+                continue
+
+            for utxo_id, (px, py) in cell.points.items():
+                dx = px - cx
+                dy = py - cy
+                if dx*dx + dy*dy <= radius_sq:
+                    result_ids.append(utxo_id)
+
+        return result_ids
+
+    def query_range_batch(
+        self,
+        centers: List[Tuple[float, float]],
+        radius: float
+    ) -> List[List[str]]:
+        """
+        Find UTXO IDs within radius of each of several center points.
+
+        Args:
+            centers: (x, y) coordinates to search around
+            radius: Search radius in Cartesian space
+
+        Returns:
+            One list of UTXO IDs per center, in the same order as centers
+
+        Notes:
+            With a KD-tree, all centers are resolved in a single
+            query_ball_point call; otherwise each center is queried in turn.
+        """
+        centers = list(centers)
+        if not centers:
+            return []
+
+        if self._needs_rebuild():
+            self.rebuild_index()
+
+        if self._kdtree is not None:
+            try:
+                hits = self._kdtree.query_ball_point(centers, radius)
+                radius_sq = radius * radius
+                return [
+                    self._reconcile_tree_hits(indices, center, radius_sq)
+                    for indices, center in zip(hits, centers)
+                ]
+            except Exception:
+                # Per-center queries below handle (and report) tree failures
+                pass
+
+        return [self.query_range(center, radius) for center in centers]
+
+    def _reconcile_tree_hits(
+        self,
+        indices: List[int],
+        center: Tuple[float, float],
+        radius_sq: float
+    ) -> List[str]:
+        """
+        Turn KD-tree hits into current UTXO IDs.
+
+        Drops points removed since the last build and adds points
+        inserted since then, found via _pending_in_range.
+
+        Args:
+            indices: Point indices returned by the KD-tree
+            center: (x, y) coordinate searched around
+            radius_sq: Squared search radius
 
-        return list(result_ids)
+        Returns:
+            List of UTXO IDs within the radius
+        """
+        tree_ids = self._kdtree_ids
+        stale = self._stale
+        result = [tree_ids[i] for i in indices if tree_ids[i] not in stale]
+        if self._pending:
+            result.extend(self._pending_in_range(center, radius_sq))
+        return result
+
+    def _pending_in_range(
+        self,
+        center: Tuple[float, float],
+        radius_sq: float
+    ) -> List[str]:
+        """
+        Find points inserted since the last KD-tree build within range.
+
+        The grid is always current, so when the cells around center hold
+        fewer points than _pending, those cells are checked instead of
+        every pending point.
+
+        Args:
+            center: (x, y) coordinate to search around
+            radius_sq: Squared search radius
+
+        Returns:
+            List of pending UTXO IDs within the radius
+        """
+        pending = self._pending
+        cx, cy = center
+        result: List[str] = []
+
+        cells = []
+        budget = len(pending)
+        for cell_idx in self._get_neighboring_cells(center, math.sqrt(radius_sq)):
+            cell = self._grid.get(cell_idx)
+            if cell is not None:
+                budget -= len(cell.points)
+                if budget < 0:
+                    break
+                cells.append(cell)
+
+        if budget >= 0:
+            for cell in cells:
+                for utxo_id, (px, py) in cell.points.items():
+                    if utxo_id in pending:
+                        dx = px - cx
+                        dy = py - cy
+                        if dx*dx + dy*dy <= radius_sq:
+                            result.append(utxo_id)
+            return result
+
+        # Cells are denser than the pending set: scan it directly
+        points = self._points
+        id_to_idx = self._id_to_idx
+        for utxo_id in pending:
+            px, py = points[id_to_idx[utxo_id]]
+            dx = px - cx
+            dy = py - cy
+            if dx*dx + dy*dy <= radius_sq:
+                result.append(utxo_id)
+        return result
 
     def get_utxo_by_id(self, utxo_id: str) -> Optional['FractalUTXO']:
         """
@@ -216,5 +437,10 @@ class UTXOSpatialIndexer:
         """Clear all indexed points."""
         self._points.clear()
         self._ids.clear()
+        self._id_to_idx.clear()
         self._kdtree = None
+        self._kdtree_ids.clear()
+        self._pending.clear()
+        self._stale.clear()
+        self._dirty = 0
         self._grid.clear()
@@ -4,7 +4,8 @@ Implementation of the UTXOStorage class for LEGACY Protocol.
 This class provides in-memory storage for UTXOs with spatial indexing capabilities.
 """
 
-from typing import Dict, Optional, List, Tuple
+from fractions import Fraction
+from typing import Dict, Iterable, Optional, List, Tuple
 from .utxo import FractalUTXO
 from .indexer import UTXOSpatialIndexer
 
@@ -15,14 +16,21 @@ class UTXOStorage:
     Attributes:
         _utxos (Dict[str, FractalUTXO]): Maps UTXO IDs to UTXO objects
         _spatial_index (UTXOSpatialIndexer): Spatial index for neighbor queries
-        _shard_indices (Dict[int, List[str]]): Maps shard IDs to lists of UTXO IDs
+        _coords (Dict[str, Tuple[float, float]]): Cartesian position of each UTXO
+        _shard_indices (Dict[int, Dict[str, None]]): Maps shard IDs to UTXO IDs,
+            kept as insertion-ordered dict keys for O(1) removal
+        _total_balance (Fraction): Exact running sum of all stored UTXO amounts
+        _shard_balances (Dict[int, Fraction]): Exact running sum of UTXO amounts per shard
     """
 
     def __init__(self):
         """Initialize empty UTXO storage with spatial indexing."""
         self._utxos: Dict[str, FractalUTXO] = {}
         self._spatial_index = UTXOSpatialIndexer()
-        self._shard_indices: Dict[int, List[str]] = {}
+        self._coords: Dict[str, Tuple[float, float]] = {}
+        self._shard_indices: Dict[int, Dict[str, None]] = {}
+        self._total_balance = Fraction(0)
+        self._shard_balances: Dict[int, Fraction] = {}
 
     def add_utxo(self, utxo: FractalUTXO) -> None:
         """
@@ -32,32 +40,67 @@ class UTXOStorage:
             utxo: FractalUTXO instance to add
 
         Raises:
-            ValueError: If UTXO with same ID already exists
+            ValueError: If UTXO is missing or one with same ID already exists
         """
-        if utxo.utxo_id in self._utxos:
-            raise ValueError(f"UTXO {utxo.utxo_id} already exists")
+        if utxo is None:
+            raise ValueError("UTXO must not be None")
 
+        utxo_id = utxo.utxo_id
+        if utxo_id in self._utxos:
+            raise ValueError(f"UTXO {utxo_id} already exists")
+
+        # Only the spatial insert can fail, and the indexer rolls itself back,
+        # so nothing else is touched until it has succeeded
         try:
-            # Add to main storage
-            self._utxos[utxo.utxo_id] = utxo
+            coords = utxo.coordinate.to_cartesian()
+            self._spatial_index.insert(utxo_id, coords)
+        except Exception as e:
+            raise ValueError(f"Error adding UTXO: {str(e)}")
 
-            # Update spatial index
-            x, y = utxo.coordinate.to_cartesian()
-            self._spatial_index.insert(utxo.utxo_id, (x, y))
+        self._utxos[utxo_id] = utxo
+        self._coords[utxo_id] = coords
 
-            # Update shard index
-            shard = utxo.shard_affinity
-            if shard not in self._shard_indices:
-                self._shard_indices[shard] = []
-            self._shard_indices[shard].append(utxo.utxo_id)
+        # Update shard index and balances
+        shard = utxo.shard_affinity
+        self._shard_indices.setdefault(shard, {})[utxo_id] = None
+        amount = Fraction(utxo.amount)
+        self._total_balance += amount
+        self._shard_balances[shard] = (
+            self._shard_balances.get(shard, 0) + amount
+        )
 
-        except Exception as e:
-            # Rollback on error
-            self._utxos.pop(utxo.utxo_id, None)
-            self._spatial_index.remove(utxo.utxo_id, (x, y))
-            if shard in self._shard_indices:
-                self._shard_indices[shard].remove(utxo.utxo_id)
-            raise ValueError(f"Error adding UTXO: {str(e)}")
+    def add_utxos(self, utxos: Iterable[FractalUTXO]) -> None:
+        """
+        Insert a batch of UTXOs atomically, e.g. when loading a snapshot.
+
+        All IDs are checked before anything is inserted, and a failure part
+        way through removes the UTXOs already added. The spatial index defers
+        its KD-tree build to the next query, so the batch costs one build.
+
+        Args:
+            utxos: FractalUTXO instances to add
+
+        Raises:
+            ValueError: If any UTXO is missing, already stored or repeated
+        """
+        utxos = list(utxos)
+        seen = set()
+        for utxo in utxos:
+            if utxo is None:
+                raise ValueError("UTXO must not be None")
+            if utxo.utxo_id in self._utxos or utxo.utxo_id in seen:
+                raise ValueError(f"UTXO {utxo.utxo_id} already exists")
+            seen.add(utxo.utxo_id)
+
+        added: List[str] = []
+        try:
+            for utxo in utxos:
+                self.add_utxo(utxo)
+                added.append(utxo.utxo_id)
+        except ValueError:
+            for utxo_id in reversed(added):
+                self.remove_utxo(utxo_id)
+            raise
 
     def remove_utxo(self, utxo_id: str) -> None:
         """
@@ -74,20 +117,26 @@ class UTXOStorage:
             raise ValueError(f"UTXO {utxo_id} not found")
 
         try:
-            # Remove from spatial index
-            x, y = utxo.coordinate.to_cartesian()
-            self._spatial_index.remove(utxo_id, (x, y))
+            # Remove from spatial index, reusing the position stored on insert
+            self._spatial_index.remove(utxo_id, self._coords.pop(utxo_id))
+            amount = Fraction(utxo.amount)
 
             # Remove from shard index
             shard = utxo.shard_affinity
-            if shard in self._shard_indices:
-                self._shard_indices[shard].remove(utxo_id)
-                if not self._shard_indices[shard]:
+            bucket = self._shard_indices.get(shard)
+            if bucket is not None:
+                del bucket[utxo_id]
+                if not bucket:
                     del self._shard_indices[shard]
+                    del self._shard_balances[shard]
+                else:
+                    self._shard_balances[shard] -= amount
 
             # Remove from main storage
             del self._utxos[utxo_id]
 
+            self._total_balance -= amount
+
         except Exception as e:
             raise ValueError(f"Error removing UTXO: {str(e)}")
 
@@ -103,6 +152,19 @@ class UTXOStorage:
         """
         return self._utxos.get(utxo_id)
 
+    def get_many(self, utxo_ids: List[str]) -> Dict[str, FractalUTXO]:
+        """
+        Retrieve several UTXOs by ID in one call.
+
+        Args:
+            utxo_ids: IDs of UTXOs to retrieve
+
+        Returns:
+            Dictionary mapping each found ID to its UTXO; missing IDs are omitted
+        """
+        utxos = self._utxos
+        return {uid: utxos[uid] for uid in utxo_ids if uid in utxos}
+
     def get_utxos_by_shard(self, shard_id: int) -> List[FractalUTXO]:
         """
         Get all UTXOs in a specific shard.
@@ -113,8 +175,8 @@ class UTXOStorage:
         Returns:
             List of UTXOs in the shard
         """
-        utxo_ids = self._shard_indices.get(shard_id, [])
-        return [self._utxos[uid] for uid in utxo_ids if uid in self._utxos]
+        utxos = self._utxos
+        return [utxos[uid] for uid in self._shard_indices.get(shard_id, ())]
 
     def get_spatial_neighbors(self, utxo: FractalUTXO, radius: float) -> List[FractalUTXO]:
         """
@@ -131,13 +193,13 @@ class UTXOStorage:
             ValueError: If spatial query fails
         """
         try:
-            center = utxo.coordinate.to_cartesian()
+            center = self._coords.get(utxo.utxo_id)
+            if center is None:
+                center = utxo.coordinate.to_cartesian()
             neighbor_ids = self._spatial_index.query_range(center, radius)
-            return [
-                self._utxos[n_id] 
-                for n_id in neighbor_ids 
-                if n_id in self._utxos and n_id != utxo.utxo_id
-            ]
+            utxos = self._utxos
+            utxo_id = utxo.utxo_id
+            return [utxos[n_id] for n_id in neighbor_ids if n_id != utxo_id]
         except Exception as e:
             raise ValueError(f"Error querying spatial neighbors: {str(e)}")
 
@@ -145,23 +207,29 @@ class UTXOStorage:
         """
         Calculate total balance across all UTXOs.
 
+        Maintained incrementally by add_utxo/remove_utxo as an exact
+        Fraction, so this is O(1) and the result is the correctly rounded
+        sum regardless of the order UTXOs were added and removed.
+
         Returns:
             float: Sum of all UTXO amounts
         """
-        return sum(utxo.amount for utxo in self._utxos.values())
+        return float(self._total_balance)
 
     def get_balance_by_shard(self) -> Dict[int, float]:
         """
         Calculate total balance per shard.
 
+        Maintained incrementally by add_utxo/remove_utxo as exact Fractions,
+        so this costs one conversion per non-empty shard.
+
         Returns:
             Dict mapping shard ID to total balance in that shard
         """
-        balances: Dict[int, float] = {}
-        for utxo in self._utxos.values():
-            shard = utxo.shard_affinity
-            balances[shard] = balances.get(shard, 0.0) + utxo.amount
-        return balances
+        return {
+            shard: float(balance)
+            for shard, balance in self._shard_balances.items()
+        }
 
     def all_utxos(self) -> List[FractalUTXO]:
         """
@@ -175,5 +243,8 @@ class UTXOStorage:
     def clear(self) -> None:
         """Clear all UTXOs and indices."""
         self._utxos.clear()
-        self._spatial_index = UTXOSpatialIndexer()
+        self._spatial_index.clear()
+        self._coords.clear()
         self._shard_indices.clear()
+        self._total_balance = Fraction(0)
+        self._shard_balances.clear()
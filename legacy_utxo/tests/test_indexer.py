@@ -4,6 +4,7 @@ Tests for the UTXOSpatialIndexer class.
 
 import pytest
 import math
+import legacy_utxo.indexer as indexer_module
 from legacy_utxo.indexer import UTXOSpatialIndexer, GridCell
 
 @pytest.fixture
@@ -11,6 +12,14 @@ def indexer():
     """Create a fresh UTXOSpatialIndexer instance for each test."""
     return UTXOSpatialIndexer(grid_size=0.1)
 
+def brute_force(indexer, center, radius):
+    """IDs within radius of center, by checking every indexed point."""
+    cx, cy = center
+    return sorted(
+        utxo_id for utxo_id, (px, py) in zip(indexer._ids, indexer._points)
+        if (px - cx)**2 + (py - cy)**2 <= radius * radius
+    )
+
 def test_grid_cell():
     """Test GridCell functionality."""
     cell = GridCell()
@@ -105,6 +114,26 @@ def test_range_query_with_points(indexer):
     results = indexer.query_range((0.5, 0.5), 1.0)
     assert len(results) == 3
 
+def test_range_query_batch(indexer):
+    """Test batched range queries match single queries."""
+    assert indexer.query_range_batch([], 0.1) == []
+    
+    for i in range(600):
+        indexer.insert(f"utxo{i}", ((i % 30) / 30.0, (i // 30) / 20.0))
+    indexer.rebuild_index()
+    
+    # Changes since the build must be reflected too
+    indexer.insert("late", (0.5, 0.5))
+    indexer.remove("utxo0", (0.0, 0.0))
+    
+    centers = [(0.5, 0.5), (0.0, 0.0), (0.9, 0.1)]
+    batch = indexer.query_range_batch(centers, 0.12)
+    assert len(batch) == len(centers)
+    for center, ids in zip(centers, batch):
+        assert sorted(ids) == sorted(indexer.query_range(center, 0.12))
+    assert "late" in batch[0]
+    assert "utxo0" not in batch[1]
+
 def test_kdtree_fallback(indexer):
     """Test fallback to grid-based search when KDTree fails."""
     # Force KDTree to None to test grid-based fallback
@@ -134,6 +163,119 @@ def test_index_rebuild(indexer):
     if indexer._kdtree is not None:  # If scipy is available
         assert len(indexer._points) == 600
 
+def test_threshold_rebuild(indexer):
+    """Test query_range rebuilds the KD-tree once enough changes accumulate."""
+    if indexer_module.KDTree is None:
+        pytest.skip("scipy not available")
+    
+    for i in range(indexer._rebuild_threshold - 1):
+        indexer.insert(f"utxo{i}", ((i % 25) / 25.0, (i // 25) / 20.0))
+    indexer.query_range((0.5, 0.5), 0.1)
+    assert indexer._kdtree is None  # Below threshold: grid search only
+    
+    indexer.insert("last", (0.5, 0.5))
+    results = indexer.query_range((0.5, 0.5), 0.1)
+    assert indexer._kdtree is not None
+    assert indexer._dirty == 0
+    assert not indexer._pending and not indexer._stale
+    assert sorted(results) == brute_force(indexer, (0.5, 0.5), 0.1)
+
+def test_remove_reinsert_before_rebuild(indexer):
+    """Test an ID removed and reinserted between KD-tree builds."""
+    if indexer_module.KDTree is None:
+        pytest.skip("scipy not available")
+    
+    for i in range(100):
+        indexer.insert(f"utxo{i}", ((i % 10) / 10.0, (i // 10) / 10.0))
+    indexer.rebuild_index()
+    
+    # Move utxo11 from (0.1, 0.1) to (0.85, 0.85) without a rebuild
+    indexer.remove("utxo11", (0.1, 0.1))
+    indexer.insert("utxo11", (0.85, 0.85))
+    assert indexer._kdtree is not None
+    assert "utxo11" in indexer._stale and "utxo11" in indexer._pending
+    
+    for center in [(0.1, 0.1), (0.85, 0.85), (0.5, 0.5)]:
+        for radius in (0.05, 0.2, 1.5):
+            results = indexer.query_range(center, radius)
+            assert len(results) == len(set(results))
+            assert sorted(results) == brute_force(indexer, center, radius)
+    assert "utxo11" not in indexer.query_range((0.1, 0.1), 0.05)
+    assert "utxo11" in indexer.query_range((0.85, 0.85), 0.05)
+    
+    # Removing it again drops it everywhere
+    indexer.remove("utxo11", (0.85, 0.85))
+    assert "utxo11" not in indexer.query_range((0.85, 0.85), 1.5)
+
+def test_many_pending_points(indexer):
+    """Test queries while points are pending since the last build."""
+    if indexer_module.KDTree is None:
+        pytest.skip("scipy not available")
+    
+    # Dense base away from the query area, so nearby cells are sparse
+    for i in range(10000):
+        indexer.insert(f"utxo{i}", (5 + (i % 100) / 100.0, 5 + (i // 100) / 100.0))
+    indexer.rebuild_index()
+    
+    # Up to sqrt(n) pending points stay out of the tree
+    for i in range(100):
+        indexer.insert(f"new{i}", ((i * 37 % 101) / 101.0, (i * 53 % 97) / 97.0))
+    
+    for center in [(0.5, 0.5), (0.05, 0.95), (-0.2, 0.3), (5.5, 5.5)]:
+        for radius in (0.02, 0.15, 8.0):
+            results = indexer.query_range(center, radius)
+            assert len(results) == len(set(results))
+            assert sorted(results) == brute_force(indexer, center, radius)
+    assert len(indexer._pending) == 100
+    
+    # One more exceeds sqrt(n) and merges them into the tree
+    indexer.insert("last", (0.5, 0.5))
+    assert "last" in indexer.query_range((0.5, 0.5), 0.01)
+    assert not indexer._pending
+    assert len(indexer._kdtree_ids) == 10101
+
+def test_grid_negative_coordinates(indexer, monkeypatch):
+    """Test grid search around the origin with whole-cell coverage."""
+    monkeypatch.setattr(indexer_module, "KDTree", None)
+    
+    coords = [(x / 20.0, y / 20.0) for x in range(-12, 13) for y in range(-12, 13)]
+    coords += [(-0.001, 0.001), (0.001, -0.001), (-0.099, -0.099), (0.0, 0.0)]
+    for i, coord in enumerate(coords):
+        indexer.insert(f"utxo{i}", coord)
+    
+    # Radius 0.35 covers several 0.1 cells on each side of the origin
+    for center in [(0.0, 0.0), (-0.23, -0.17), (0.31, -0.42), (-0.05, 0.05)]:
+        for radius in (0.03, 0.15, 0.35):
+            results = indexer.query_range(center, radius)
+            assert indexer._kdtree is None
+            assert len(results) == len(set(results))
+            assert sorted(results) == brute_force(indexer, center, radius)
+
+def test_swap_pop_removal(indexer):
+    """Test removing a middle entry moves the last entry into its slot."""
+    indexer.insert("a", (0.1, 0.1))
+    indexer.insert("b", (0.5, 0.5))
+    indexer.insert("c", (0.9, 0.9))
+    
+    indexer.remove("b", (0.5, 0.5))
+    assert indexer._ids == ["a", "c"]
+    assert indexer._points == [(0.1, 0.1), (0.9, 0.9)]
+    assert indexer._id_to_idx == {"a": 0, "c": 1}
+    assert indexer.query_range((0.9, 0.9), 0.01) == ["c"]
+    assert indexer.query_range((0.5, 0.5), 0.01) == []
+    
+    # Moved entry can still be removed by ID
+    indexer.remove("c", (0.9, 0.9))
+    assert indexer._ids == ["a"]
+    assert indexer._id_to_idx == {"a": 0}
+    
+    with pytest.raises(ValueError, match="already indexed"):
+        indexer.insert("a", (0.2, 0.2))
+    with pytest.raises(ValueError, match="not indexed"):
+        indexer.remove("b", (0.5, 0.5))
+    assert indexer._ids == ["a"]
+    assert indexer._points == [(0.1, 0.1)]
+
 def test_clear_index(indexer):
     """Test clearing the spatial index."""
     # Add some points
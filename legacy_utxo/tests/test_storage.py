@@ -2,6 +2,7 @@
 Tests for the UTXOStorage class.
 """
 
+import math
 import pytest
 from legacy_coordinate.coordinate import FractalCoordinate
 from legacy_utxo.utxo import FractalUTXO
@@ -44,6 +45,57 @@ def test_add_utxo(storage, sample_utxo):
     with pytest.raises(ValueError, match="already exists"):
         storage.add_utxo(sample_utxo)
 
+def test_add_utxo_rollback(storage, sample_utxo, monkeypatch):
+    """Test that a failed insert leaves storage unchanged."""
+    def fail():
+        raise RuntimeError("boom")
+    
+    monkeypatch.setattr(sample_utxo.coordinate, "to_cartesian", fail)
+    with pytest.raises(ValueError, match="Error adding UTXO"):
+        storage.add_utxo(sample_utxo)
+    
+    assert storage.get_utxo(sample_utxo.utxo_id) is None
+    assert storage.get_total_balance() == 0.0
+    assert storage.get_balance_by_shard() == {}
+    
+    # Retrying after the failure succeeds
+    monkeypatch.undo()
+    storage.add_utxo(sample_utxo)
+    assert storage.get_utxo(sample_utxo.utxo_id) == sample_utxo
+
+def test_add_utxos(storage, sample_utxo):
+    """Test atomic batch insertion of UTXOs."""
+    utxos = [
+        FractalUTXO(
+            owner_address="0x1234",
+            amount=float(i + 1),
+            coordinate=FractalCoordinate(depth=1, path=[i]),
+            creation_height=100
+        )
+        for i in range(3)
+    ]
+    storage.add_utxos(utxos)
+    assert storage.all_utxos() == utxos
+    assert storage.get_total_balance() == 6.0
+    
+    # A repeated ID anywhere in the batch rejects the whole batch
+    storage.clear()
+    with pytest.raises(ValueError, match="already exists"):
+        storage.add_utxos([sample_utxo, utxos[0], sample_utxo])
+    assert storage.all_utxos() == []
+    
+    with pytest.raises(ValueError):
+        storage.add_utxos([sample_utxo, None])
+    assert storage.all_utxos() == []
+
+def test_get_many(storage, sample_utxo):
+    """Test batch retrieval of UTXOs."""
+    storage.add_utxo(sample_utxo)
+    
+    found = storage.get_many([sample_utxo.utxo_id, "nonexistent_id"])
+    assert found == {sample_utxo.utxo_id: sample_utxo}
+    assert storage.get_many([]) == {}
+
 def test_remove_utxo(storage, sample_utxo):
     """Test removing UTXOs from storage."""
     storage.add_utxo(sample_utxo)
@@ -84,6 +136,30 @@ def test_balance_tracking(storage):
     shard_balances = storage.get_balance_by_shard()
     assert shard_balances[0] == 10.0
     assert shard_balances[1] == 50.0
+    
+    # Balances follow removals
+    storage.remove_utxo(utxos[1].utxo_id)
+    assert storage.get_total_balance() == 40.0
+    assert storage.get_balance_by_shard() == {0: 10.0, 1: 30.0}
+    for utxo in (utxos[0], utxos[2]):
+        storage.remove_utxo(utxo.utxo_id)
+    assert storage.get_total_balance() == 0.0
+    assert storage.get_balance_by_shard() == {}
+
+def test_balance_precision(storage):
+    """Test balances stay exact when a large UTXO is removed."""
+    coord = FractalCoordinate(depth=1, path=[0])
+    utxos = [
+        FractalUTXO(owner_address="0x1234", amount=amount, coordinate=coord, creation_height=100)
+        for amount in (0.1, 0.2, 0.3, 1e16, 0.7)
+    ]
+    for utxo in utxos:
+        storage.add_utxo(utxo)
+    
+    storage.remove_utxo(utxos[3].utxo_id)
+    expected = math.fsum([0.1, 0.2, 0.3, 0.7])
+    assert storage.get_total_balance() == expected
+    assert storage.get_balance_by_shard() == {0: expected}
 
 def test_spatial_queries(storage):
     """Test spatial neighbor queries."""
@@ -121,6 +197,11 @@ def test_clear_storage(storage, sample_utxo):
     assert len(storage.all_utxos()) == 0
     assert storage.get_total_balance() == 0.0
     assert storage.get_balance_by_shard() == {}
+    
+    # Storage is reusable after clearing
+    storage.add_utxo(sample_utxo)
+    assert storage.get_utxo(sample_utxo.utxo_id) == sample_utxo
+    assert storage.get_spatial_neighbors(sample_utxo, 1.0) == []
 
 def test_multiple_shards(storage):
     """Test handling UTXOs across multiple shards."""
@@ -23,6 +23,7 @@ def test_utxo_initialization():
     assert utxo.creation_height == 100
     assert utxo.script == "OP_CHECKSIG"  # default script
     assert utxo.shard_affinity == 1  # from path[0]
+    assert not hasattr(utxo, "__dict__")
 
     # Test invalid amount
     with pytest.raises(ValueError, match="amount must be positive"):
@@ -174,6 +175,23 @@ def test_fractal_merge():
     assert merged.amount == 3.0  # Sum of all amounts
     assert merged.coordinate == parent_coord
     assert merged.owner_address == "0x1234"
+    
+    # Merged amount is the correctly rounded sum
+    fractional = [
+        FractalUTXO(
+            owner_address="0x1234",
+            amount=amount,
+            coordinate=coord,
+            creation_height=100,
+            script="OP_FRACTAL_MERGE"
+        )
+        for amount, coord in zip([0.1, 0.2, 0.3], child_coords)
+    ]
+    result = fractional[0].execute_script({
+        "current_height": 101,
+        "siblings": fractional[1:]
+    })
+    assert result["new_utxo"].amount == 0.6
 
 def test_spatial_neighbors():
     """Test spatial neighbor querying."""
@@ -196,15 +214,26 @@ def test_spatial_neighbors():
     
     # Mock spatial indexer
     class MockIndexer:
+        def __init__(self):
+            self.lookups = 0
+        
         def query_range(self, center, radius):
-            return ["utxo2_id"]
+            return ["utxo2_id", "missing_id"]
         
         def get_utxo_by_id(self, utxo_id):
+            self.lookups += 1
             return utxo2 if utxo_id == "utxo2_id" else None
     
-    neighbors = utxo1.get_spatial_neighbors(0.5, MockIndexer())
+    indexer = MockIndexer()
+    neighbors = utxo1.get_spatial_neighbors(0.5, indexer)
     assert len(neighbors) == 1
     assert neighbors[0] == utxo2
+    assert indexer.lookups == 2  # one lookup per returned ID
+    
+    # Batched form returns one neighbor list per UTXO
+    assert FractalUTXO.get_spatial_neighbors_many(
+        [utxo1, utxo2], 0.5, indexer
+    ) == [[utxo2], [utxo2]]
 
 def test_spending_validation():
     """Test UTXO spending validation."""
@@ -7,6 +7,8 @@ derived from its position in the Sierpinski triangle coordinate system.
 
 from typing import Optional, Dict, Any, List
 import hashlib
+import math
+import sys
 from legacy_coordinate.coordinate import FractalCoordinate
 
 class FractalUTXO:
@@ -26,6 +28,11 @@ class FractalUTXO:
         gas_limit (Optional[int]): Gas limit for contract execution (if applicable)
     """
 
+    __slots__ = (
+        'owner_address', 'amount', 'script', 'coordinate', 'shard_affinity',
+        'creation_height', 'contract_state_hash', 'gas_limit', 'utxo_id'
+    )
+
     def __init__(self,
                  owner_address: str,
                  amount: float,
@@ -58,7 +65,8 @@ class FractalUTXO:
             if not gas_limit:
                 raise ValueError("gas_limit required for OP_CONTRACTCALL")
 
-        self.owner_address = owner_address
+        # Intern so UTXOs of the same wallet share one address string
+        self.owner_address = sys.intern(owner_address)
         self.amount = amount
         self.script = script
         self.coordinate = coordinate
@@ -156,9 +164,10 @@ class FractalUTXO:
         result: Dict[str, Any] = {"status": False}
 
         try:
-            if self.script == "OP_CHECKSIG":
-                result["status"] = True
-                return result
+            # Exact opcodes dispatch with a single lookup
+            handler = self._SCRIPT_HANDLERS.get(self.script)
+            if handler is not None:
+                return handler(self, context)
 
             if self.script.startswith("OP_RETURN"):
                 result["status"] = True
@@ -168,12 +177,6 @@ class FractalUTXO:
             if self.script.startswith("OP_CONTRACTCALL"):
                 return self._execute_contract_call(context)
 
-            if self.script == "OP_FRACTAL_SPLIT":
-                return self._execute_fractal_split(context)
-
-            if self.script == "OP_FRACTAL_MERGE":
-                return self._execute_fractal_merge(context)
-
             result["error"] = "Unknown script opcode"
             return result
 
@@ -181,6 +184,10 @@ class FractalUTXO:
             result["error"] = str(e)
             return result
 
+    def _execute_checksig(self, context: Dict[str, Any]) -> Dict[str, Any]:
+        """Helper method to handle OP_CHECKSIG execution."""
+        return {"status": True}
+
     def _execute_contract_call(self, context: Dict[str, Any]) -> Dict[str, Any]:
         """Helper method to handle OP_CONTRACTCALL execution."""
         parts = self.script.split(":")
@@ -246,7 +253,9 @@ class FractalUTXO:
                 "error": "No sibling UTXOs provided for merge"
             }
 
-        total_amount = self.amount + sum(sib.amount for sib in siblings)
+        # fsum is exact up to the final rounding, so the merged amount does
+        # not depend on sibling order
+        total_amount = math.fsum([self.amount] + [sib.amount for sib in siblings])
         parent_coord = self.coordinate.get_parent()
         current_height = context.get("current_height", 0)
 
@@ -263,6 +272,14 @@ class FractalUTXO:
             "new_utxo": merged
         }
 
+    # Handlers for scripts that are a bare opcode; prefixed scripts
+    # (OP_RETURN, OP_CONTRACTCALL:<addr>) are matched in execute_script
+    _SCRIPT_HANDLERS = {
+        "OP_CHECKSIG": _execute_checksig,
+        "OP_FRACTAL_SPLIT": _execute_fractal_split,
+        "OP_FRACTAL_MERGE": _execute_fractal_merge,
+    }
+
     def get_spatial_neighbors(self, radius: float, indexer: 'UTXOSpatialIndexer') -> List['FractalUTXO']:
         """
         Query the spatial indexer to find UTXOs within 'radius' of this UTXO's coordinate.
@@ -280,10 +297,56 @@ class FractalUTXO:
         try:
             center = self.coordinate.to_cartesian()
             utxo_ids = indexer.query_range(center, radius)
-            return [
-                indexer.get_utxo_by_id(u_id) 
-                for u_id in utxo_ids 
-                if indexer.get_utxo_by_id(u_id)
-            ]
+
+            # Look each ID up once; the indexer may be backed by a slow store
+            get_utxo = indexer.get_utxo_by_id
+            neighbors: List[FractalUTXO] = []
+            for u_id in utxo_ids:
+                utxo = get_utxo(u_id)
+                if utxo:
+                    neighbors.append(utxo)
+            return neighbors
+        except Exception as e:
+            raise ValueError(f"Error querying spatial neighbors: {str(e)}")
+
+    @classmethod
+    def get_spatial_neighbors_many(
+        cls,
+        utxos: List['FractalUTXO'],
+        radius: float,
+        indexer: 'UTXOSpatialIndexer'
+    ) -> List[List['FractalUTXO']]:
+        """
+        Run get_spatial_neighbors for several UTXOs with one batched query.
+
+        Args:
+            utxos: UTXOs whose neighborhoods to find
+            radius: float (Euclidean distance threshold)
+            indexer: UTXOSpatialIndexer instance; indexers without
+                     query_range_batch are queried once per UTXO
+
+        Returns:
+            List[List[FractalUTXO]]: Neighbors of each UTXO, in input order
+
+        Raises:
+            ValueError: If spatial query fails
+        """
+        try:
+            centers = [utxo.coordinate.to_cartesian() for utxo in utxos]
+            if hasattr(indexer, "query_range_batch"):
+                id_lists = indexer.query_range_batch(centers, radius)
+            else:
+                id_lists = [indexer.query_range(c, radius) for c in centers]
+
+            get_utxo = indexer.get_utxo_by_id
+            results: List[List[FractalUTXO]] = []
+            for utxo_ids in id_lists:
+                neighbors: List[FractalUTXO] = []
+                for u_id in utxo_ids:
+                    utxo = get_utxo(u_id)
+                    if utxo:
+                        neighbors.append(utxo)
+                results.append(neighbors)
+            return results
         except Exception as e:
             raise ValueError(f"Error querying spatial neighbors: {str(e)}")